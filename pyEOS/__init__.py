@@ -12,4 +12,5 @@
 # License for the specific language governing permissions and limitations under
 # the License.
 
-from eos import EOS
\ No newline at end of file
+from eos import EOS
+from config import EOSConf
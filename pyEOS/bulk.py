@@ -0,0 +1,350 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import json
+import logging
+import os
+import Queue
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def flatten(data, prefix=''):
+    """
+    Flattens nested dictionaries into a single dictionary joining the keys with dots. Lists are serialized as JSON
+    strings so every value is a scalar.
+
+    :param data: Dictionary to flatten.
+    :param prefix: String prepended to every key.
+    :return: A flat dictionary.
+    """
+    record = dict()
+    for key, value in data.iteritems():
+        name = '%s%s' % (prefix, key)
+        if isinstance(value, dict):
+            record.update(flatten(value, '%s.' % name))
+        elif isinstance(value, list):
+            record[name] = json.dumps(value, sort_keys=True)
+        else:
+            record[name] = value
+    return record
+
+
+def _is_table(value):
+    if isinstance(value, dict):
+        values = value.values()
+    elif isinstance(value, list):
+        values = value
+    else:
+        return False
+    return len(values) > 0 and all(isinstance(v, dict) for v in values)
+
+
+def normalize(output):
+    """
+    Turns the JSON output of a show command into flat records. Top level dictionaries of dictionaries and lists of
+    dictionaries (like 'interfaceStatuses' or 'lldpNeighbors') are considered tables and give one record per entry. The
+    column '_table' tells which table the record comes from and '_key' its key in the table (or its index for lists).
+    The rest of the output is flattened and added to every record. If there are no tables a single record is returned.
+    The key '_meta' is dropped.
+
+    :param output: JSON output of a command.
+    :return: A list of flat dictionaries.
+    """
+    tables = dict()
+    common = dict()
+
+    for key, value in output.iteritems():
+        if key == '_meta':
+            continue
+        elif _is_table(value):
+            tables[key] = value
+        else:
+            common[key] = value
+
+    common = flatten(common)
+
+    if not tables:
+        return [common]
+
+    records = list()
+    for name, table in sorted(tables.iteritems()):
+        entries = table.iteritems() if isinstance(table, dict) else enumerate(table)
+        for key, entry in entries:
+            record = dict(common)
+            record.update(flatten(entry))
+            record['_table'] = name
+            record['_key'] = unicode(key)
+            records.append(record)
+    return records
+
+
+def _slug(command):
+    return re.sub(r'\W+', '_', command).strip('_')
+
+
+class Sink(object):
+    """
+    Receives the records of a collection. Subclass it and implement write and close to store them anywhere you want.
+    """
+
+    def write(self, command, records):
+        """
+        Stores a batch of records.
+
+        :param command: Command the records come from.
+        :param records: List of flat dictionaries.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Called once when the collection is over.
+        """
+        pass
+
+
+class JSONLinesSink(Sink):
+    """
+    Writes the records of each command to its own file in JSON lines format.
+
+    :param directory: Directory where the files are created.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.files = dict()
+
+    def write(self, command, records):
+        if command not in self.files:
+            self.files[command] = open(os.path.join(self.directory, '%s.jsonl' % _slug(command)), 'w')
+
+        f = self.files[command]
+        for record in records:
+            f.write('%s\n' % json.dumps(record, sort_keys=True))
+
+    def close(self):
+        for f in self.files.itervalues():
+            f.close()
+
+
+_INT64 = 2 ** 63
+
+
+def _kind(value):
+    if value is None:
+        return 'null'
+    elif isinstance(value, bool):
+        return 'bool'
+    elif isinstance(value, (int, long)):
+        return 'int' if -_INT64 <= value < _INT64 else 'string'
+    elif isinstance(value, float):
+        return 'float'
+    else:
+        return 'string'
+
+
+def _widen(kind, other):
+    if kind == other or other == 'null':
+        return kind
+    elif kind == 'null':
+        return other
+    elif set((kind, other)) == set(('int', 'float')):
+        return 'float'
+    else:
+        return 'string'
+
+
+def _convert(kind, value):
+    if value is None:
+        return None
+    elif kind == 'float':
+        return float(value)
+    elif kind == 'string' and not isinstance(value, basestring):
+        return unicode(value)
+    else:
+        return value
+
+
+class ArrowSink(Sink):
+    """
+    Writes the records of each command to its own Parquet or Arrow IPC file. It requires pyarrow.
+
+    The type of each column is inferred from the values it gets: columns with only nulls so far get the type of the
+    first value that shows up, integers are promoted to floats if a float shows up and any other mix is stored as
+    strings. As the schema of a file can't change once it's created, when a batch brings new columns or needs a wider
+    type the current file is closed and the following records go to a new one with the updated schema. The first file
+    of a command is named after the command, i.e. show_version.parquet, the following ones get a sequence number, i.e.
+    show_version.1.parquet. No value is ever dropped.
+
+    :param directory: Directory where the files are created.
+    :param format: Either 'parquet' or 'ipc'.
+    """
+
+    def __init__(self, directory, format='parquet'):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError('ArrowSink requires pyarrow, install it with "pip install pyEOS[arrow]"')
+
+        if format not in ('parquet', 'ipc'):
+            raise ValueError("format must be either 'parquet' or 'ipc'")
+
+        self.pa = pyarrow
+        self.directory = directory
+        self.format = format
+        self.types = {
+            'null': pyarrow.null(),
+            'bool': pyarrow.bool_(),
+            'int': pyarrow.int64(),
+            'float': pyarrow.float64(),
+            'string': pyarrow.string(),
+        }
+        self.writers = dict()
+        self.kinds = dict()
+        self.parts = dict()
+
+    def _open(self, command, schema):
+        extension = 'parquet' if self.format == 'parquet' else 'arrow'
+        part = self.parts.get(command, 0)
+        self.parts[command] = part + 1
+
+        if part == 0:
+            name = '%s.%s' % (_slug(command), extension)
+        else:
+            name = '%s.%d.%s' % (_slug(command), part, extension)
+        path = os.path.join(self.directory, name)
+
+        if self.format == 'parquet':
+            import pyarrow.parquet
+            return pyarrow.parquet.ParquetWriter(path, schema), None
+        else:
+            f = self.pa.OSFile(path, 'wb')
+            return self.pa.RecordBatchFileWriter(f, schema), f
+
+    def _close(self, command):
+        writer, f = self.writers.pop(command)
+        writer.close()
+        if f is not None:
+            f.close()
+
+    def write(self, command, records):
+        kinds = dict(self.kinds.get(command, dict()))
+        for record in records:
+            for name, value in record.iteritems():
+                kinds[name] = _widen(kinds.get(name, 'null'), _kind(value))
+
+        names = sorted(kinds)
+        schema = self.pa.schema([self.pa.field(n, self.types[kinds[n]]) for n in names])
+
+        if kinds != self.kinds.get(command):
+            if command in self.writers:
+                logger.info('%s: schema changed, writing the following records to a new file', command)
+                self._close(command)
+            self.kinds[command] = kinds
+            self.writers[command] = self._open(command, schema)
+
+        columns = list()
+        for name in names:
+            values = [_convert(kinds[name], r.get(name)) for r in records]
+            columns.append(self.pa.array(values, type=self.types[kinds[name]]))
+
+        self.writers[command][0].write_table(self.pa.Table.from_arrays(columns, schema=schema))
+
+    def close(self):
+        for command in list(self.writers):
+            self._close(command)
+
+
+def collect(devices, commands, sink, workers=10, batch_size=1000):
+    """
+    Runs the same commands on many devices concurrently, normalizes the JSON outputs into flat records (see normalize)
+    and sends them to the sink in batches while the collection is still running. Every record gets a '_host' column
+    with the hostname of the device. Only a few device responses are kept in memory at any given time.
+
+    :param devices: List of EOS objects. They are opened and closed by this function.
+    :param commands: List of commands to run on every device. They have to support JSON output.
+    :param sink: Sink object where the records are written to. It's closed when the collection is over.
+    :param workers: How many devices are queried at the same time. By default is 10.
+    :param batch_size: How many records of the same command are buffered before calling sink.write. By default is 1000.
+    :return: A dictionary with the hostname of the devices that failed as keys and the exceptions as values.
+    """
+    if workers < 1:
+        raise ValueError('workers must be at least 1')
+
+    devices = list(devices)
+    pending = Queue.Queue()
+    for device in devices:
+        pending.put(device)
+
+    # Bounded so workers wait for us instead of piling up responses in memory
+    results = Queue.Queue(maxsize=workers)
+
+    def worker():
+        while True:
+            try:
+                device = pending.get_nowait()
+            except Queue.Empty:
+                return
+
+            # Exactly one result per device no matter what, otherwise the main loop would wait forever
+            outputs, error = None, None
+            try:
+                try:
+                    device.open()
+                    outputs = device.run_commands(list(commands))[1:]
+                except BaseException as e:
+                    error = e
+
+                try:
+                    device.close()
+                except BaseException as e:
+                    logger.warning('%s: failed to close the connection: %s', device.hostname, e)
+            finally:
+                results.put((device.hostname, outputs, error))
+
+    for i in range(min(workers, len(devices))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+
+    buffers = dict((command, list()) for command in commands)
+    errors = dict()
+
+    try:
+        for i in range(len(devices)):
+            hostname, outputs, error = results.get()
+
+            if error is not None:
+                errors[hostname] = error
+                continue
+
+            for command, output in zip(commands, outputs):
+                for record in normalize(output):
+                    record['_host'] = hostname
+                    buffers[command].append(record)
+
+                if len(buffers[command]) >= batch_size:
+                    sink.write(command, buffers[command])
+                    buffers[command] = list()
+
+        for command in commands:
+            if buffers[command]:
+                sink.write(command, buffers[command])
+    finally:
+        sink.close()
+
+    return errors
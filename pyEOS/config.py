@@ -93,22 +93,56 @@ class EOSConf:
         else:
             self.cmds = self._load_file(filename)
 
+    def iter_lines(self):
+        """
+        Generates the configuration line by line, each line terminated by a newline. Nothing is buffered so this is
+        the cheapest way of walking through big configurations.
+
+        :return: A generator yielding the lines of the configuration.
+        """
+        for key, value in self.cmds.iteritems():
+            yield '%s\n' % key
+
+            for k, sub_value in value['cmds'].iteritems():
+                yield '   %s\n' % k
+
+                for sk in sub_value['cmds'].iterkeys():
+                    yield '      %s\n' % sk
+
+    def write_to(self, fileobj):
+        """
+        Writes the configuration into a file-like object without building the whole string in memory.
+
+        :param fileobj: Any object with a write method, for example an open file.
+        """
+        write = fileobj.write
+        for line in self.iter_lines():
+            write(line)
+
     def to_string(self):
         """
 
         :return: A string representation of the configuration.
         """
-        txt = ''
-        for key, value in self.cmds.iteritems():
-            txt += '%s\n' % key
+        return ''.join(self.iter_lines())
+
+    def changed_sections(self, other):
+        """
+        Finds which top level commands differ between the self object and the other object, including their children.
+
+        :param other: Configuration object you want to do the comparison with.
+        :return: A list with the top level commands added, removed or modified on the other object.
+        """
+        def _flatten(block):
+            return [(k, tuple(v['cmds'].iterkeys())) for k, v in block['cmds'].iteritems()]
 
-            for k in value['cmds'].keys():
-                txt += '   %s\n' % k
+        changed = [cmd for cmd in self.cmds.iterkeys() if cmd not in other.cmds]
 
-                for sk in value['cmds'][k]['cmds'].keys():
-                    txt += '      %s\n' % sk
+        for cmd, block in other.cmds.iteritems():
+            if cmd not in self.cmds or sorted(_flatten(block)) != sorted(_flatten(self.cmds[cmd])):
+                changed.append(cmd)
 
-        return txt
+        return changed
 
     def compare_config(self, other):
         """
@@ -12,46 +12,73 @@
 # License for the specific language governing permissions and limitations under
 # the License.
 
-from jsonrpclib import Server
-from jsonrpclib import ProtocolError
+import copy
+import re
+from collections import OrderedDict
+
 from config import EOSConf
+from filters import apply_filters
 
 import exceptions
 
 
 class EOS:
-    def __init__(self, hostname, username, password, use_ssl=True):
+    def __init__(self, hostname, username, password, use_ssl=True, compression=True):
         """
         Represents a device running EOS.
 
         The object will contain the following interesting attributes:
 
         * **running_config** - The configuration retrieved from the device using the method load_running_config
+        * **running_config_text** - The raw text of the configuration last retrieved by load_running_config
         * **candidate_config** - The configuration we desire for the device. Can be populated using the method load_candidate_config
 
         :param hostname: IP or FQDN of the device you want to connect to
         :param username: Username
         :param password: Password
         :param use_ssl: If set you True we will connect to the eAPI using https, otherwise http will be used
+        :param compression: If set to True we will ask the device to compress its responses with gzip or deflate
         """
         self.hostname = hostname
         self.username = username
         self.device = None
         self.password = password
         self.use_ssl = use_ssl
+        self.compression = compression
+        self.transport = None
         self.running_config = EOSConf('running')
+        self.running_config_text = None
         self.candidate_config = EOSConf('candidate')
         self.original_config = None
+        self._committed_config = None
+        self._cache = dict()
 
     def __getattr__(self, item):
         def wrapper(*args, **kwargs):
             pipe = kwargs.pop('pipe', None)
+            cache = kwargs.pop('cache', False)
+            filters = dict((f, kwargs.pop(f)) for f in ('path', 'section', 'include', 'exclude') if f in kwargs)
 
             if pipe is None:
-                cmd = [item.replace('_', ' ')]
+                cmd = item.replace('_', ' ')
+            else:
+                cmd = '{} | {}'.format(item.replace('_', ' '), pipe)
+
+            key = (cmd, tuple(sorted(kwargs.items())))
+
+            if cache and key in self._cache:
+                output = self._cache[key]
             else:
-                cmd = ['{} | {}'.format(item.replace('_', ' '), pipe)]
-            return self.run_commands(cmd, **kwargs)[1]
+                output = self.run_commands([cmd], **kwargs)[1]
+                if cache:
+                    self._cache[key] = output
+
+            if filters:
+                output = apply_filters(output, **filters)
+            if cache:
+                # Filters don't modify their input so we only copy what the caller gets, usually much smaller
+                output = copy.deepcopy(output)
+            return output
 
         if item.startswith('show'):
             return wrapper
@@ -62,12 +89,30 @@ class EOS:
         """
         Opens the connection with the device.
         """
+        # The network stack is imported here so users parsing configurations offline don't have to pay for it
+        from jsonrpclib import Server
+        from transport import CompressedTransport
+        from transport import CompressedSafeTransport
+
         if self.use_ssl:
             url = 'https://%s:%s@%s/command-api' % (self.username, self.password, self.hostname)
+            self.transport = CompressedSafeTransport()
         else:
             url = 'http://%s:%s@%s/command-api' % (self.username, self.password, self.hostname)
+            self.transport = CompressedTransport()
+
+        self.transport.compression = self.compression
+        self.device = Server(url, transport=self.transport)
 
-        self.device = Server(url)
+    def get_stats(self):
+        """
+
+        :return: A dictionary with the number of requests sent to the device, the bytes received through the wire and
+            the bytes they took once decompressed.
+        """
+        if self.transport is None:
+            return dict(requests=0, wire_bytes=0, bytes=0)
+        return dict(self.transport.stats)
 
     def run_commands(self, commands, version=1, auto_format=False, format='json', timestamps=True):
         """
@@ -81,6 +126,7 @@ class EOS:
         :param timestamps: This will return some useful information like when was the command executed and how long it took.
 
         """
+        from jsonrpclib import ProtocolError
 
         if 'enable' is not commands[0]:
             commands.insert(0, 'enable')
@@ -128,6 +174,13 @@ class EOS:
 
         return result
 
+    def clear_cache(self):
+        """
+        Forgets the outputs of the show commands cached with the parameter 'cache'. It's done automatically when the
+        configuration is replaced.
+        """
+        self._cache.clear()
+
     def close(self):
         """
         Dummy, method. Today it does not do anything but it would be interesting to use it to fake closing a connection.
@@ -150,7 +203,8 @@ class EOS:
         """
         Populates the attribute running_config with the running configuration of the device.
         """
-        self.running_config.load_config(config=self.get_config(format('text')))
+        self.running_config_text = self.get_config(format='text')
+        self.running_config.load_config(config=self.running_config_text)
 
     def load_candidate_config(self, filename=None, config=None):
         """
@@ -177,7 +231,7 @@ class EOS:
         self.load_running_config()
         return self.running_config.compare_config(self.candidate_config)
 
-    def replace_config(self, config=None, force=False):
+    def replace_config(self, config=None, force=False, original_config=None):
         """
         Applies the configuration changes on the device. You can either commit the changes on the candidate_config
         attribute or you can send the desired configuration as a string. Note that the current configuration of the
@@ -185,6 +239,9 @@ class EOS:
 
         :param config: String containing the desired configuration. If set to None the candidate_config will be used
         :param force: If set to False we rollback changes if we detect a config error.
+        :param original_config: String containing the configuration the device is running right now. It is kept to be
+            able to rollback. If set to None it will be retrieved from the device. If you just called compare_config
+            you can save a round-trip sending running_config_text.
 
         """
         if config is None:
@@ -199,16 +256,75 @@ class EOS:
             'cmd': 'configure replace terminal: %s' % force_text,
             'input': config
         }
-        self.original_config = self.get_config(format='text')
+        if original_config is None:
+            original_config = self.get_config(format='text')
+
+        self.original_config = original_config
+        self.clear_cache()
+        self._committed_config = None
         result = self.run_commands([body])
 
         if 'Invalid' not in result[1]['messages'][0]:
+            self._committed_config = config
             return result
         else:
             raise exceptions.CommandError(result[1]['messages'][0])
 
     def rollback(self):
         """
-        If used after a commit, the configuration will be reverted to the previous state.
+        If used after a commit, the configuration will be reverted to the previous state. The configuration we committed
+        is kept as the state to go back to so there is no need to retrieve it from the device again.
         """
-        return self.replace_config(config=self.original_config, force=True)
+        return self.replace_config(config=self.original_config, force=True, original_config=self._committed_config)
+
+    def verify_config(self, max_sections=10):
+        """
+        Checks that the last call to replace_config (or rollback) converged. Instead of retrieving the whole running
+        configuration from the device only the sections touched by the change are retrieved, all of them in a single
+        request. The device renders the whole running configuration for each section it's asked for so if the change
+        touched many sections the running configuration is retrieved once instead and the sections are taken from it.
+
+        :param max_sections: Maximum number of sections to retrieve one by one. By default is 10.
+        :return: A string showing the difference between the touched sections of the running configuration and the
+            configuration we committed. If the device converged it will be empty.
+        :raise NoCommitError: If there was no successful call to replace_config to verify.
+        """
+        if self.original_config is None or self._committed_config is None:
+            raise exceptions.NoCommitError('there is no successful replace_config or rollback to verify')
+
+        original = EOSConf('original')
+        original.load_config(config=self.original_config)
+        committed = EOSConf('committed')
+        committed.load_config(config=self._committed_config)
+
+        sections = original.changed_sections(committed)
+
+        if len(sections) == 0:
+            return ''
+
+        if len(sections) > max_sections:
+            outputs = [self.get_config(format='text')]
+        else:
+            cmds = ['sh running-config | section ^%s$' % _escape_regex(section) for section in sections]
+            outputs = [output['output'] for output in self.run_commands(cmds, format='text')[1:]]
+
+        running = OrderedDict()
+        for output in outputs:
+            parsed = EOSConf._parse_config(output)
+            for section in sections:
+                if section in parsed:
+                    running[section] = parsed[section]
+
+        expected = OrderedDict((section, committed.cmds[section]) for section in sections if section in committed.cmds)
+
+        running_config = EOSConf('running')
+        running_config.load_config(config=running)
+        expected_config = EOSConf('committed')
+        expected_config.load_config(config=expected)
+
+        return running_config.compare_config(expected_config)
+
+
+def _escape_regex(text):
+    # The regex is sent to the CLI so we can't use re.escape, it escapes spaces too
+    return re.sub(r'([.^$*+?()\[\]{}|\\])', r'\\\1', text)
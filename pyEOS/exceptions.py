@@ -22,4 +22,10 @@ class CommandError(Exception):
     pass
 
 class UnknownError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class FilterError(Exception):
+    pass
+
+class NoCommitError(Exception):
+    pass
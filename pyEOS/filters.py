@@ -0,0 +1,197 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Client side equivalents of the "| include", "| exclude" and "| section" pipes of the CLI. They work both on JSON
+outputs and on text outputs (dictionaries with the key 'output') so a single response from the device can be filtered
+in as many ways as you want without going back to the device.
+"""
+
+import re
+
+import exceptions
+
+
+def _leaves(data):
+    if isinstance(data, dict):
+        for key, value in data.iteritems():
+            yield key
+            for leaf in _leaves(value):
+                yield leaf
+    elif isinstance(data, list):
+        for value in data:
+            for leaf in _leaves(value):
+                yield leaf
+    elif data is not None:
+        yield data
+
+
+def _matches(regex, data):
+    for leaf in _leaves(data):
+        if regex.search(unicode(leaf)):
+            return True
+    return False
+
+
+def _filter_entries(data, regex, keep):
+    if isinstance(data, dict):
+        return dict((k, v) for k, v in data.iteritems() if _matches(regex, {k: v}) is keep)
+    elif isinstance(data, list):
+        return [v for v in data if _matches(regex, v) is keep]
+    else:
+        raise exceptions.FilterError('include/exclude need a dictionary or a list, got %s' % type(data).__name__)
+
+
+def _filter_lines(text, regex, keep):
+    return '\n'.join(l for l in text.splitlines() if bool(regex.search(l)) is keep)
+
+
+def _sections(text):
+    block = list()
+    for line in text.splitlines():
+        if not line.startswith(' ') and block:
+            yield block
+            block = list()
+        block.append(line)
+    if block:
+        yield block
+
+
+def _walk(data, keys):
+    if not keys:
+        return data
+
+    key, rest = keys[0], keys[1:]
+
+    if key == '*':
+        if isinstance(data, dict):
+            result = dict()
+            for k, v in data.iteritems():
+                try:
+                    result[k] = _walk(v, rest)
+                except exceptions.FilterError:
+                    pass
+            return result
+        elif isinstance(data, list):
+            result = list()
+            for v in data:
+                try:
+                    result.append(_walk(v, rest))
+                except exceptions.FilterError:
+                    pass
+            return result
+    else:
+        try:
+            if isinstance(data, list):
+                return _walk(data[int(key)], rest)
+            elif isinstance(data, dict):
+                return _walk(data[key], rest)
+        except (KeyError, IndexError, ValueError):
+            pass
+
+    raise exceptions.FilterError("path element '%s' not found" % key)
+
+
+def json_path(output, path):
+    """
+    Walks through a JSON output following a path like 'interfaceStatuses.*.linkStatus'. Each element of the path is
+    either a key of a dictionary, an index of a list or '*' to go through all the elements. Elements missing the rest
+    of the path are dropped when using '*'.
+
+    :param output: JSON output of a command.
+    :param path: Elements of the path separated by dots.
+    :return: The part of the output the path points to.
+    """
+    return _walk(output, path.split('.'))
+
+
+def filter_include(output, pattern):
+    """
+    Keeps the lines of a text output or the entries of a JSON dictionary or list matching the regular expression. A
+    JSON entry matches if any of its keys or values does.
+
+    :param output: Text or JSON output of a command.
+    :param pattern: Regular expression.
+    :return: The filtered output.
+    """
+    regex = re.compile(pattern)
+    if isinstance(output, basestring):
+        return _filter_lines(output, regex, True)
+    return _filter_entries(output, regex, True)
+
+
+def filter_exclude(output, pattern):
+    """
+    Opposite of filter_include.
+
+    :param output: Text or JSON output of a command.
+    :param pattern: Regular expression.
+    :return: The filtered output.
+    """
+    regex = re.compile(pattern)
+    if isinstance(output, basestring):
+        return _filter_lines(output, regex, False)
+    return _filter_entries(output, regex, False)
+
+
+def filter_section(output, pattern):
+    """
+    On a text output keeps the sections (a line without indentation and all the indented lines after it) where any
+    line matches the regular expression. On a JSON dictionary keeps the keys matching the regular expression.
+
+    :param output: Text or JSON output of a command.
+    :param pattern: Regular expression.
+    :return: The filtered output.
+    """
+    regex = re.compile(pattern)
+    if isinstance(output, basestring):
+        blocks = (b for b in _sections(output) if any(regex.search(l) for l in b))
+        return '\n'.join('\n'.join(b) for b in blocks)
+    elif isinstance(output, dict):
+        return dict((k, v) for k, v in output.iteritems() if regex.search(k))
+    else:
+        raise exceptions.FilterError('section needs a dictionary, got %s' % type(output).__name__)
+
+
+def apply_filters(output, path=None, section=None, include=None, exclude=None):
+    """
+    Applies several filters to the output of a command, in the same order as the parameters. The output is not
+    modified.
+
+    :param output: Output of a command as returned by EOS.run_commands.
+    :param path: See json_path. Only valid for JSON outputs.
+    :param section: See filter_section.
+    :param include: See filter_include.
+    :param exclude: See filter_exclude.
+    :return: The filtered output. For text outputs a dictionary with the key 'output'.
+    """
+    text = isinstance(output, dict) and isinstance(output.get('output'), basestring)
+
+    if text:
+        if path is not None:
+            raise exceptions.FilterError('path can only be used with JSON outputs')
+        data = output['output']
+    else:
+        data = output
+
+    if path is not None:
+        data = json_path(data, path)
+
+    for function, pattern in ((filter_section, section), (filter_include, include), (filter_exclude, exclude)):
+        if pattern is not None:
+            data = function(data, pattern)
+
+    if text:
+        return dict(output, output=data)
+    return data
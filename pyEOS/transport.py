@@ -0,0 +1,110 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import zlib
+
+from jsonrpclib.jsonrpc import Transport
+from jsonrpclib.jsonrpc import SafeTransport
+
+import exceptions
+
+# Accepts both gzip and zlib headers
+_WBITS = zlib.MAX_WBITS | 32
+_CHUNK_SIZE = 16 * 1024
+
+
+class _Inflater(object):
+    """
+    Inflates gzip, zlib and raw deflate streams. Many servers send "Content-Encoding: deflate" without the zlib header
+    so if the first chunk can't be read with a header we start over reading raw deflate.
+    """
+
+    def __init__(self):
+        self.decompressor = zlib.decompressobj(_WBITS)
+        self.first = True
+
+    def decompress(self, data):
+        if self.first:
+            self.first = False
+            try:
+                return self.decompressor.decompress(data)
+            except zlib.error:
+                self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self.decompressor.decompress(data)
+
+    def flush(self):
+        return self.decompressor.flush()
+
+
+class CompressionMixIn(object):
+    """
+    Asks the eAPI for a compressed response and inflates it while it is being read, chunk by chunk. Devices that do
+    not compress their responses are handled transparently.
+
+    The attribute stats keeps track of how many requests were sent, how many bytes went through the wire and how many
+    bytes they took once decompressed.
+    """
+    compression = True
+
+    def __init__(self):
+        super(CompressionMixIn, self).__init__()
+        self.stats = dict(requests=0, wire_bytes=0, bytes=0)
+
+    def send_request(self, connection, handler, request_body):
+        if self.compression:
+            connection.putrequest('POST', handler, skip_accept_encoding=True)
+            connection.putheader('Accept-Encoding', 'gzip, deflate')
+        else:
+            connection.putrequest('POST', handler)
+
+    def parse_response(self, response):
+        encoding = response.getheader('Content-Encoding', '')
+
+        if encoding in ('gzip', 'deflate'):
+            decompressor = _Inflater()
+        else:
+            decompressor = None
+
+        p, u = self.getparser()
+        self.stats['requests'] += 1
+
+        try:
+            while True:
+                data = response.read(_CHUNK_SIZE)
+                if not data:
+                    break
+                self.stats['wire_bytes'] += len(data)
+
+                if decompressor is not None:
+                    data = decompressor.decompress(data)
+                self.stats['bytes'] += len(data)
+                p.feed(data)
+
+            if decompressor is not None:
+                data = decompressor.flush()
+                self.stats['bytes'] += len(data)
+                p.feed(data)
+        except zlib.error as e:
+            raise exceptions.UnknownError('could not decompress %s response: %s' % (encoding, e))
+
+        p.close()
+        return u.close()
+
+
+class CompressedTransport(CompressionMixIn, Transport):
+    pass
+
+
+class CompressedSafeTransport(CompressionMixIn, SafeTransport):
+    pass
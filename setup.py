@@ -18,6 +18,9 @@ setup(
     py_modules=['pyEOS'],
     packages=find_packages(),
     install_requires=reqs,
+    extras_require={
+        'arrow': ['pyarrow'],
+    },
     include_package_data=True,
     description = 'Python API to interact with network devices running EOS',
     author = 'David Barroso',
@@ -0,0 +1,88 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+
+def _indent(level):
+    return '   ' * level
+
+
+def _address(first_octet, index):
+    # Spreads the index over the last three octets so addresses stay unique for up to 2^24 of them
+    return '%d.%d.%d.%d' % (first_octet, index / 65536, index / 256 % 256, index % 256)
+
+
+def generate_config(interfaces=48, vrfs=2, neighbors=4, acl_entries=10, depth=3, banner_lines=0, change_every=0):
+    """
+    Generates a synthetic EOS configuration.
+
+    :param interfaces: Number of Ethernet interfaces.
+    :param vrfs: Number of VRFs, each of them gets a "vrf definition" and a "vrf" block under "router bgp".
+    :param neighbors: Number of BGP neighbors per VRF.
+    :param acl_entries: Number of entries of the access list.
+    :param depth: Nesting depth of the BGP configuration, from 1 to 3. With 3 neighbors live under their VRF, with 2
+        they live directly under "router bgp" and with 1 everything is a top level command.
+    :param banner_lines: Number of lines of the motd banner. With 0 there is no banner.
+    :param change_every: If different from 0, every nth interface and BGP neighbor is slightly different. Use it to
+        generate a candidate configuration to compare with.
+    :return: A string with the configuration.
+    """
+    def changed(i):
+        return change_every and i % change_every == 0
+
+    lines = ['hostname synthetic', '!', 'spanning-tree mode mstp', '!']
+
+    if banner_lines:
+        lines.append('banner motd')
+        lines.extend('synthetic banner line %d' % i for i in range(banner_lines))
+        lines.extend(['EOF', '!'])
+
+    for v in range(vrfs):
+        lines.append('vrf definition vrf%d' % v)
+        lines.append('%srd 65000:%d' % (_indent(1), v))
+        lines.append('!')
+
+    for i in range(interfaces):
+        lines.append('interface Ethernet%d' % (i + 1))
+        lines.append('%sdescription %s %d' % (_indent(1), 'changed' if changed(i) else 'link', i))
+        lines.append('%sno switchport' % _indent(1))
+        if vrfs:
+            lines.append('%svrf forwarding vrf%d' % (_indent(1), i % vrfs))
+        lines.append('%sip address %s/31' % (_indent(1), _address(10, 2 * i)))
+        lines.append('!')
+
+    lines.append('ip access-list synthetic')
+    for e in range(acl_entries):
+        lines.append('%s%d permit ip 10.%d.%d.0/24 any' % (_indent(1), (e + 1) * 10, e / 256, e % 256))
+    lines.append('!')
+
+    bgp = ['router bgp 65000']
+    for v in range(vrfs):
+        vrf = 'vrf vrf%d' % v
+        if depth >= 3:
+            bgp.append('%s%s' % (_indent(1), vrf))
+        for n in range(neighbors):
+            asn = 65100 + n + (1000 if changed(n) else 0)
+            for cmd in ('remote-as %d' % asn, 'maximum-routes 12000'):
+                neighbor = 'neighbor %s %s' % (_address(172, v * neighbors + n), cmd)
+                if depth >= 3:
+                    bgp.append('%s%s' % (_indent(2), neighbor))
+                elif depth == 2:
+                    bgp.append('%s%s' % (_indent(1), neighbor))
+                else:
+                    bgp.append('router bgp 65000 %s %s' % (vrf, neighbor))
+
+    lines.extend(bgp if depth > 1 else bgp[1:])
+    lines.extend(['!', 'end'])
+
+    return '\n'.join(lines) + '\n'
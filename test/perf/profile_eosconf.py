@@ -0,0 +1,167 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Profiles the parse, diff and serialize phases of EOSConf on synthetic configurations. For example:
+
+    $ PYTHONPATH=. python test/perf/profile_eosconf.py --interfaces 10000 --vrfs 50 --neighbors 20 --json
+
+Time is the best of --repeat runs. For memory each phase reports:
+
+* **peak_bytes** - Highest amount of memory the phase had allocated at any point while it was running.
+* **retained_bytes** and **retained_blocks** - Memory still held by the result of the phase once it finishes.
+
+Memory is measured with tracemalloc. On python 2 it's provided by pytracemalloc, which needs a patched interpreter.
+Without it each phase runs in a forked process and peak_bytes is the growth of its peak RSS as reported by
+getrusage, while the retained fields are None. The field memory_source tells which one was used. To get tracemalloc
+on python 2 install pytracemalloc following https://pytracemalloc.readthedocs.io/install.html
+"""
+
+import argparse
+import json
+import os
+import resource
+import time
+
+from pyEOS.config import EOSConf
+
+from generator import generate_config
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def _measure_tracemalloc(function):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        # Keep the result alive until the second snapshot so it's accounted for
+        result = function()
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, 'lineno')
+    return dict(
+        memory_source='tracemalloc',
+        peak_bytes=peak,
+        retained_bytes=sum(s.size_diff for s in stats),
+        retained_blocks=sum(s.count_diff for s in stats),
+    )
+
+
+def _measure_rusage(function):
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        status = 1
+        try:
+            os.close(read_end)
+            before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            function()
+            after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is in kilobytes on Linux
+            os.write(write_end, str((after - before) * 1024))
+            status = 0
+        finally:
+            os._exit(status)
+
+    os.close(write_end)
+    output = os.read(read_end, 64)
+    os.close(read_end)
+    os.waitpid(pid, 0)
+    growth = int(output) if output else None
+
+    return dict(memory_source='rusage', peak_bytes=growth, retained_bytes=None, retained_blocks=None)
+
+
+def measure(phase, function, repeat):
+    # Memory goes first, before the timing runs leave garbage behind
+    result = dict(phase=phase)
+    if tracemalloc is not None:
+        result.update(_measure_tracemalloc(function))
+    else:
+        result.update(_measure_rusage(function))
+
+    seconds = None
+    for i in range(repeat):
+        start = time.time()
+        function()
+        elapsed = time.time() - start
+        if seconds is None or elapsed < seconds:
+            seconds = elapsed
+
+    result['seconds'] = seconds
+    return result
+
+
+def profile(repeat=3, **kwargs):
+    """
+    Runs every phase against a running configuration and a candidate configuration generated with the same parameters.
+
+    :param repeat: How many times each phase is run to take the time.
+    :param kwargs: Parameters for generate_config.
+    :return: A list with one dictionary per phase.
+    """
+    running_text = generate_config(**kwargs)
+    candidate_text = generate_config(change_every=10, **kwargs)
+
+    running = EOSConf('running')
+    candidate = EOSConf('candidate')
+    running.load_config(config=running_text)
+    candidate.load_config(config=candidate_text)
+
+    return [
+        measure('parse', lambda: EOSConf._parse_config(running_text), repeat),
+        measure('compare_config', lambda: running.compare_config(candidate), repeat),
+        measure('to_string', lambda: running.to_string(), repeat),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profiles EOSConf on synthetic configurations.')
+    parser.add_argument('--interfaces', type=int, default=1000)
+    parser.add_argument('--vrfs', type=int, default=10)
+    parser.add_argument('--neighbors', type=int, default=10)
+    parser.add_argument('--acl-entries', type=int, default=100)
+    parser.add_argument('--depth', type=int, default=3, choices=[1, 2, 3])
+    parser.add_argument('--banner-lines', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='Print one JSON document per phase.')
+    args = parser.parse_args()
+
+    results = profile(
+        repeat=args.repeat,
+        interfaces=args.interfaces,
+        vrfs=args.vrfs,
+        neighbors=args.neighbors,
+        acl_entries=args.acl_entries,
+        depth=args.depth,
+        banner_lines=args.banner_lines,
+    )
+
+    for result in results:
+        if args.json:
+            print(json.dumps(result, sort_keys=True))
+        else:
+            print('%(phase)-15s %(seconds)10.4fs  peak_bytes=%(peak_bytes)s  retained_bytes=%(retained_bytes)s  '
+                  'retained_blocks=%(retained_blocks)s  (%(memory_source)s)' % result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyEOS import bulk
+import pyEOS.exceptions as exceptions
+
+
+VERSION = {u'modelName': u'DCS-7150S-64-CL-F', u'version': u'4.14.5F', u'_meta': {u'execDuration': 0.01}}
+
+LLDP = {
+    u'tablesDrops': 0,
+    u'lldpNeighbors': [
+        {u'neighborDevice': u'switch1', u'port': u'Ethernet1'},
+        {u'neighborDevice': u'switch2', u'port': u'Ethernet2'},
+    ],
+}
+
+INTERFACES = {
+    u'interfaceStatuses': {
+        u'Ethernet1': {u'linkStatus': u'connected', u'vlanInformation': {u'vlanId': 10}},
+    },
+}
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class FakeDevice(object):
+
+    def __init__(self, hostname, fail=False, fail_close=False):
+        self.hostname = hostname
+        self.fail = fail
+        self.fail_close = fail_close
+
+    def open(self):
+        pass
+
+    def close(self):
+        if self.fail_close:
+            raise IOError('connection reset')
+
+    def run_commands(self, commands):
+        if self.fail:
+            raise exceptions.CommandError('failed')
+        outputs = {'show version': VERSION, 'show lldp neighbors': LLDP}
+        return [{}] + [outputs[c] for c in commands]
+
+
+class ListSink(bulk.Sink):
+
+    def __init__(self):
+        self.records = dict()
+        self.batches = 0
+        self.closed = False
+
+    def write(self, command, records):
+        self.records.setdefault(command, list()).extend(records)
+        self.batches += 1
+
+    def close(self):
+        self.closed = True
+
+
+class TestBulk(unittest.TestCase):
+
+    def test_normalize_without_tables(self):
+        self.assertEqual(bulk.normalize(VERSION), [{u'modelName': u'DCS-7150S-64-CL-F', u'version': u'4.14.5F'}])
+
+    def test_normalize_list_table(self):
+        records = bulk.normalize(LLDP)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[1], {u'tablesDrops': 0, u'neighborDevice': u'switch2', u'port': u'Ethernet2',
+                                      '_table': u'lldpNeighbors', '_key': u'1'})
+
+    def test_normalize_dict_table(self):
+        records = bulk.normalize(INTERFACES)
+        self.assertEqual(records, [{u'linkStatus': u'connected', u'vlanInformation.vlanId': 10,
+                                    '_table': u'interfaceStatuses', '_key': u'Ethernet1'}])
+
+    def test_collect(self):
+        devices = [FakeDevice('switch%d' % i) for i in range(10)] + [FakeDevice('broken', fail=True)]
+        sink = ListSink()
+        errors = bulk.collect(devices, ['show version', 'show lldp neighbors'], sink, workers=3, batch_size=4)
+
+        self.assertEqual(errors.keys(), ['broken'])
+        self.assertEqual(len(sink.records['show version']), 10)
+        self.assertEqual(len(sink.records['show lldp neighbors']), 20)
+        self.assertEqual(set(r['_host'] for r in sink.records['show version']), set('switch%d' % i for i in range(10)))
+        self.assertGreater(sink.batches, 2)
+        self.assertTrue(sink.closed)
+
+    def test_collect_survives_failing_close(self):
+        devices = [FakeDevice('switch1', fail_close=True), FakeDevice('broken', fail=True, fail_close=True)]
+        sink = ListSink()
+        errors = bulk.collect(devices, ['show version'], sink, workers=1)
+
+        self.assertEqual(errors.keys(), ['broken'])
+        self.assertEqual([r['_host'] for r in sink.records['show version']], ['switch1'])
+
+    def test_collect_needs_workers(self):
+        self.assertRaises(ValueError, bulk.collect, [FakeDevice('switch1')], ['show version'], ListSink(), workers=0)
+
+
+class TestSinks(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_json_lines_sink(self):
+        sink = bulk.JSONLinesSink(self.directory)
+        sink.write('show lldp neighbors', bulk.normalize(LLDP))
+        sink.write('show lldp neighbors', bulk.normalize(LLDP))
+        sink.write('show version', bulk.normalize(VERSION))
+        sink.close()
+
+        self.assertEqual(sorted(os.listdir(self.directory)), ['show_lldp_neighbors.jsonl', 'show_version.jsonl'])
+        with open(os.path.join(self.directory, 'show_lldp_neighbors.jsonl')) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records, bulk.normalize(LLDP) * 2)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_arrow_sink_widens_types(self):
+        sink = bulk.ArrowSink(self.directory)
+        sink.write('show version', [{'uptime': 10, 'serial': None}])
+        sink.write('show version', [{'uptime': 10, 'serial': None}])
+        sink.write('show version', [{'uptime': 10.5, 'serial': u'JPE1'}, {'uptime': 11, 'serial': 12}])
+        sink.close()
+
+        self.assertEqual(sorted(os.listdir(self.directory)), ['show_version.1.parquet', 'show_version.parquet'])
+
+        first = pyarrow.parquet.read_table(os.path.join(self.directory, 'show_version.parquet')).to_pydict()
+        second = pyarrow.parquet.read_table(os.path.join(self.directory, 'show_version.1.parquet')).to_pydict()
+        self.assertEqual(first['uptime'], [10, 10])
+        self.assertEqual(second['uptime'], [10.5, 11.0])
+        self.assertEqual(second['serial'], [u'JPE1', u'12'])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_arrow_sink_ipc(self):
+        sink = bulk.ArrowSink(self.directory, format='ipc')
+        sink.write('show lldp neighbors', bulk.normalize(LLDP))
+        sink.write('show lldp neighbors', bulk.normalize(LLDP))
+        sink.close()
+
+        path = os.path.join(self.directory, 'show_lldp_neighbors.arrow')
+        table = pyarrow.ipc.open_file(pyarrow.OSFile(path, 'rb')).read_all()
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(table.to_pydict()['neighborDevice'], [u'switch1', u'switch2'] * 2)
@@ -87,6 +87,18 @@ class TestEOS(unittest.TestCase):
 
         self.assertTrue(result)
 
+    def test_replace_config_verify_and_rollback(self):
+        self.device.load_candidate_config(filename='configs/new_good.conf')
+        self.device.replace_config()
+        replace_config_diff = self.device.verify_config()
+        self.device.rollback()
+        rollback_diff = self.device.verify_config()
+        last_diff = self.device.compare_config()
+
+        self.assertEqual(len(replace_config_diff), 0)
+        self.assertEqual(len(rollback_diff), 0)
+        self.assertGreater(len(last_diff), 0)
+
     def test_get_interface_config(self):
         self.device.load_running_config()
         interface = self.device.running_config['interface Ethernet2']
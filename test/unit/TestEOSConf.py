@@ -0,0 +1,44 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import unittest
+import StringIO
+
+from pyEOS.config import EOSConf
+
+
+class TestEOSConf(unittest.TestCase):
+
+    def setUp(self):
+        self.config = EOSConf('candidate')
+        self.config.load_config(filename='configs/new_good.conf')
+
+    def test_to_string_is_nested(self):
+        txt = self.config.to_string()
+        self.assertIn('router bgp 65000\n   vrf test\n      neighbor 1.1.1.2 remote-as 1\n', txt)
+
+    def test_write_to_matches_to_string(self):
+        f = StringIO.StringIO()
+        self.config.write_to(f)
+        self.assertEqual(f.getvalue(), self.config.to_string())
+
+    def test_iter_lines_matches_to_string(self):
+        self.assertEqual(''.join(self.config.iter_lines()), self.config.to_string())
+
+    def test_changed_sections(self):
+        running = EOSConf('running')
+        running.load_config(filename='configs/initial.conf')
+        changed = running.changed_sections(self.config)
+        self.assertEqual(sorted(changed), ['hostname pyeos-unittest', 'hostname pyeos-unittest-changed',
+                                           'interface Ethernet2', 'router bgp 65000'])
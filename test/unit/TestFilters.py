@@ -0,0 +1,74 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import unittest
+
+from pyEOS import EOS
+from pyEOS import filters
+import pyEOS.exceptions as exceptions
+
+
+STATUS = {
+    u'interfaceStatuses': {
+        u'Ethernet1': {u'linkStatus': u'connected', u'vlanInformation': {u'vlanId': 10}},
+        u'Ethernet2': {u'linkStatus': u'notconnect', u'vlanInformation': {u'vlanId': 20}},
+        u'Management1': {u'linkStatus': u'connected'},
+    },
+    u'_meta': {u'execDuration': 0.01},
+}
+
+TEXT = {u'output': u'router bgp 65000\n   neighbor 1.1.1.1 remote-as 1\ninterface Ethernet1\n   shutdown\n'}
+
+
+class FakeEOS(EOS):
+
+    def run_commands(self, commands, **kwargs):
+        self.requests = getattr(self, 'requests', 0) + 1
+        return [{}, {u'interfaceStatuses': {u'Ethernet1': {u'linkStatus': u'connected'}}}]
+
+
+class TestFilters(unittest.TestCase):
+
+    def test_json_path_wildcard(self):
+        vlans = filters.json_path(STATUS, 'interfaceStatuses.*.vlanInformation.vlanId')
+        self.assertEqual(vlans, {u'Ethernet1': 10, u'Ethernet2': 20})
+
+    def test_json_path_missing(self):
+        self.assertRaises(exceptions.FilterError, filters.json_path, STATUS, 'interfaceStatuses.Ethernet3')
+
+    def test_include_and_exclude_json(self):
+        output = filters.apply_filters(STATUS, path='interfaceStatuses', include='connected$', exclude='Management')
+        self.assertEqual(output.keys(), [u'Ethernet1'])
+
+    def test_section_text(self):
+        output = filters.apply_filters(TEXT, section='1.1.1.1')
+        self.assertEqual(output['output'], u'router bgp 65000\n   neighbor 1.1.1.1 remote-as 1')
+
+    def test_include_text(self):
+        output = filters.apply_filters(TEXT, include='shutdown')
+        self.assertEqual(output['output'], u'   shutdown')
+
+    def test_output_is_not_modified(self):
+        filters.apply_filters(STATUS, path='interfaceStatuses', exclude='.')
+        self.assertEqual(len(STATUS['interfaceStatuses']), 3)
+
+    def test_cached_output_is_a_copy(self):
+        device = FakeEOS('hostname', 'username', 'password')
+        device.show_interfaces_status(cache=True)['interfaceStatuses'].clear()
+        device.show_interfaces_status(cache=True)['interfaceStatuses'].clear()
+        device.show_interfaces_status(cache=True, path='interfaceStatuses')['Ethernet1'].clear()
+        status = device.show_interfaces_status(cache=True, path='interfaceStatuses.*.linkStatus')
+
+        self.assertEqual(status, {u'Ethernet1': u'connected'})
+        self.assertEqual(device.requests, 1)
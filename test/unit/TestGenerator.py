@@ -0,0 +1,57 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import os
+import sys
+import unittest
+
+from pyEOS.config import EOSConf
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'perf'))
+
+from generator import generate_config
+import profile_eosconf
+
+
+class TestGenerator(unittest.TestCase):
+
+    def parse(self, **kwargs):
+        config = EOSConf('synthetic')
+        config.load_config(config=generate_config(**kwargs))
+        return config
+
+    def test_counts_match_parameters(self):
+        config = self.parse(interfaces=300, vrfs=3, neighbors=600, acl_entries=50)
+
+        interfaces = [k for k in config.cmds if k.startswith('interface ')]
+        self.assertEqual(len(interfaces), 300)
+        self.assertEqual(len(config['ip access-list synthetic']), 50)
+        self.assertEqual(len(config['router bgp 65000']), 3)
+        for v in range(3):
+            neighbors = config.cmds['router bgp 65000']['cmds']['vrf vrf%d' % v]['cmds']
+            self.assertEqual(len(neighbors), 1200)
+
+    def test_flat_depth_counts(self):
+        config = self.parse(interfaces=1, vrfs=2, neighbors=300, depth=2)
+        self.assertEqual(len(config['router bgp 65000']), 1200)
+
+    def test_without_vrfs(self):
+        text = generate_config(interfaces=4, vrfs=0)
+        self.assertNotIn('vrf', text)
+
+    def test_profile_returns_every_phase(self):
+        results = profile_eosconf.profile(repeat=1, interfaces=10, vrfs=1, neighbors=2, acl_entries=2)
+        self.assertEqual([r['phase'] for r in results], ['parse', 'compare_config', 'to_string'])
+        for result in results:
+            self.assertGreaterEqual(result['seconds'], 0)
@@ -0,0 +1,51 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Seconds a fresh interpreter can spend importing pyEOS
+IMPORT_BUDGET = 0.05
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+SCRIPT = """
+import json, sys, time
+start = time.time()
+import pyEOS
+elapsed = time.time() - start
+print(json.dumps(dict(elapsed=elapsed, modules=list(sys.modules.keys()))))
+"""
+
+
+def cold_import():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = ROOT
+    output = subprocess.check_output([sys.executable, '-c', SCRIPT], env=env, cwd=ROOT)
+    return json.loads(output)
+
+
+class TestImport(unittest.TestCase):
+
+    def test_import_does_not_load_transport(self):
+        modules = cold_import()['modules']
+        self.assertNotIn('jsonrpclib', modules)
+        self.assertNotIn('pyEOS.transport', modules)
+
+    def test_import_time_budget(self):
+        elapsed = min(cold_import()['elapsed'] for i in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET)
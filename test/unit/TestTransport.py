@@ -0,0 +1,119 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import gzip
+import httplib
+import StringIO
+import unittest
+import zlib
+
+from pyEOS.transport import CompressionMixIn
+import pyEOS.exceptions as exceptions
+
+
+BODY = '{"jsonrpc": "2.0", "result": [{}, {"output": "%s"}], "id": 1}' % ('hostname pyeos\\n' * 5000)
+
+
+def gzip_encode(data):
+    f = StringIO.StringIO()
+    g = gzip.GzipFile(fileobj=f, mode='w')
+    g.write(data)
+    g.close()
+    return f.getvalue()
+
+
+def deflate_encode(data, wbits):
+    c = zlib.compressobj(6, zlib.DEFLATED, wbits)
+    return c.compress(data) + c.flush()
+
+
+class FakeResponse(object):
+
+    def __init__(self, body, encoding=''):
+        self.body = StringIO.StringIO(body)
+        self.encoding = encoding
+
+    def getheader(self, name, default=None):
+        if name == 'Content-Encoding' and self.encoding:
+            return self.encoding
+        return default
+
+    def read(self, size):
+        return self.body.read(size)
+
+
+class FakeTarget(object):
+
+    def __init__(self):
+        self.data = list()
+
+    def feed(self, data):
+        self.data.append(data)
+
+    def close(self):
+        return ''.join(self.data)
+
+
+class FakeTransport(CompressionMixIn):
+
+    def getparser(self):
+        target = FakeTarget()
+        return target, target
+
+
+class TestTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport()
+
+    def parse(self, body, encoding=''):
+        return self.transport.parse_response(FakeResponse(body, encoding))
+
+    def test_identity(self):
+        self.assertEqual(self.parse(BODY), BODY)
+        self.assertEqual(self.transport.stats, dict(requests=1, wire_bytes=len(BODY), bytes=len(BODY)))
+
+    def test_gzip(self):
+        body = gzip_encode(BODY)
+        self.assertEqual(self.parse(body, 'gzip'), BODY)
+        self.assertEqual(self.transport.stats, dict(requests=1, wire_bytes=len(body), bytes=len(BODY)))
+        self.assertLess(len(body), len(BODY))
+
+    def test_zlib_deflate(self):
+        self.assertEqual(self.parse(deflate_encode(BODY, zlib.MAX_WBITS), 'deflate'), BODY)
+
+    def test_raw_deflate(self):
+        self.assertEqual(self.parse(deflate_encode(BODY, -zlib.MAX_WBITS), 'deflate'), BODY)
+
+    def test_stats_add_up(self):
+        self.parse(BODY)
+        self.parse(gzip_encode(BODY), 'gzip')
+        self.assertEqual(self.transport.stats['requests'], 2)
+        self.assertEqual(self.transport.stats['bytes'], 2 * len(BODY))
+
+    def test_corrupted_body(self):
+        body = gzip_encode(BODY)
+        body = body[:100] + 'garbage' * 10 + body[170:]
+        self.assertRaises(exceptions.UnknownError, self.parse, body, 'gzip')
+
+    def test_accept_encoding(self):
+        connection = httplib.HTTPConnection('localhost')
+        self.transport.send_request(connection, '/command-api', '')
+        self.assertIn('Accept-Encoding: gzip, deflate', connection._buffer)
+
+    def test_accept_encoding_without_compression(self):
+        connection = httplib.HTTPConnection('localhost')
+        self.transport.compression = False
+        self.transport.send_request(connection, '/command-api', '')
+        self.assertIn('Accept-Encoding: identity', connection._buffer)
@@ -0,0 +1,86 @@
+# Copyright 2014 Spotify AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import unittest
+
+from pyEOS import EOS
+import pyEOS.exceptions as exceptions
+
+
+class FakeEOS(EOS):
+    """
+    Replays the configuration it was last given, the way a device would after a config replace.
+    """
+
+    def __init__(self, *args, **kwargs):
+        EOS.__init__(self, *args, **kwargs)
+        self.running = open('configs/initial.conf').read()
+        self.calls = list()
+
+    def run_commands(self, commands, **kwargs):
+        self.calls.append(commands)
+        if isinstance(commands[0], dict):
+            if 'typo' in commands[0]['input']:
+                return [{}, {u'messages': [u'% Invalid input']}]
+            self.running = commands[0]['input']
+            return [{}, {u'messages': [u'']}]
+        return [{}] + [{u'output': self.running} for c in commands]
+
+
+class TestVerify(unittest.TestCase):
+
+    def setUp(self):
+        self.device = FakeEOS('hostname', 'username', 'password')
+
+    def test_verify_without_commit(self):
+        self.assertRaises(exceptions.NoCommitError, self.device.verify_config)
+
+    def test_verify_after_commit(self):
+        self.device.load_candidate_config(filename='configs/new_good.conf')
+        self.device.replace_config()
+        self.assertEqual(self.device.verify_config(), '')
+        self.assertEqual(len(self.device.calls[-1]), 4)
+
+    def test_rejected_config_is_not_committed(self):
+        self.device.load_candidate_config(filename='configs/new_good.conf')
+        self.device.replace_config()
+        self.assertRaises(exceptions.CommandError, self.device.replace_config, config='hostname typo\n')
+        self.assertRaises(exceptions.NoCommitError, self.device.verify_config)
+
+    def test_compare_then_replace_fetches_config_once(self):
+        self.device.load_candidate_config(filename='configs/new_good.conf')
+        self.device.compare_config()
+        self.device.replace_config(original_config=self.device.running_config_text)
+
+        fetches = [c for c in self.device.calls if c == ['sh running-config']]
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(self.device.original_config, open('configs/initial.conf').read())
+
+    def test_replace_without_snapshot_fetches_config(self):
+        self.device.load_candidate_config(filename='configs/new_good.conf')
+        self.device.compare_config()
+        self.device.replace_config()
+
+        fetches = [c for c in self.device.calls if c == ['sh running-config']]
+        self.assertEqual(len(fetches), 2)
+
+    def test_verify_many_sections_fetches_config_once(self):
+        self.device.load_candidate_config(filename='configs/new_good.conf')
+        self.device.replace_config()
+        self.device.running = self.device.running.replace('description ble', 'description bla')
+
+        diff = self.device.verify_config(max_sections=2)
+
+        self.assertEqual(self.device.calls[-1], ['sh running-config'])
+        self.assertEqual(diff, 'interface Ethernet2\n+ description ble\n- description bla\n')